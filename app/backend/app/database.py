@@ -10,54 +10,115 @@
 # HOW IT WORKS:
 # ─────────────
 # 1. Reads DATABASE_URL from config.py (which reads environment variables)
-# 2. Creates a SQLAlchemy "engine" (the connection pool)
-# 3. Creates a "SessionLocal" factory (makes database sessions)
+# 2. Creates an async SQLAlchemy "engine" (the connection pool, asyncpg driver)
+# 3. Creates an "AsyncSessionLocal" registry (hands out database sessions)
 # 4. FastAPI endpoints use sessions to query/insert data
+# 5. main.py's lifespan creates the engine on startup (get_engine) and
+#    disposes it (closes the pool) on shutdown
+#
+# WHY ASYNC?
+# ──────────
+# Scans spend almost all their time waiting on the network (DNS, WHOIS,
+# PostgreSQL). With async sessions the worker can serve other requests
+# while it waits, instead of blocking a thread per request.
 #
 # CONNECTION FLOW:
 # ────────────────
-# FastAPI Request → get_db() → SessionLocal() → Engine → RDS PostgreSQL
-#                                                         ↓
-#                                         modena-dev-db.xxx.rds.amazonaws.com
+# FastAPI Request → get_db() → AsyncSessionLocal() → Engine → RDS PostgreSQL
+#                                                              ↓
+#                                              modena-dev-db.xxx.rds.amazonaws.com
 # ═══════════════════════════════════════════════════════════════════════════════
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from asyncio import current_task
+from typing import Optional
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    async_sessionmaker,
+    async_scoped_session,
+)
+from sqlalchemy.orm import declarative_base
 
 from app.config import get_settings
 
-settings = get_settings()
-
 # ─────────────────────────────────────────────────────────────────────────────────
 # DATABASE ENGINE
 # ─────────────────────────────────────────────────────────────────────────────────
 # The "engine" is SQLAlchemy's connection to the database.
 # It manages a POOL of connections (doesn't open new connection for every query).
+#
+# WHY LAZY (get_engine) INSTEAD OF A MODULE-LEVEL ENGINE?
+# Importing this module no longer reads settings or builds an engine.
+# That work happens on the first get_engine() call (main.py's lifespan),
+# which keeps imports fast for pod boot and test collection.
 
-engine = create_engine(
-    settings.database_url,
-    
-    # Connection pool settings
-    pool_size=5,           # Keep 5 connections open
-    max_overflow=10,       # Allow 10 more during high load
-    pool_timeout=30,       # Wait 30s for available connection
-    pool_recycle=1800,     # Recycle connections after 30 minutes
+_engine: Optional[AsyncEngine] = None
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Returns the shared engine, creating it on first call.
     
-    # Useful for debugging - logs all SQL queries
-    echo=settings.debug,
-)
+    Also binds the session factory below to it, so sessions work from then on.
+    """
+    global _engine
+    if _engine is None:
+        settings = get_settings()
+        _engine = create_async_engine(
+            settings.database_url,
+            
+            # Connection pool settings
+            pool_size=settings.database_pool_size,        # Connections kept open (default 20)
+            max_overflow=settings.database_max_overflow,  # Extra during high load (default 10)
+            pool_timeout=10,       # Wait 10s for available connection, then fail fast
+            pool_recycle=1500,     # Recycle connections after 25 minutes (before RDS/NAT idle cutoffs)
+            pool_pre_ping=True,    # Test connection before use - replaces stale ones after network blips
+            
+            # Useful for debugging - logs all SQL queries.
+            # Separate from DEBUG on purpose: logging every statement costs time on
+            # every query, so it stays off unless SQL_ECHO=true is set explicitly.
+            echo=settings.sql_echo,
+            echo_pool=False,       # Don't log pool checkouts/checkins either
+            logging_name="modena", # Names the engine's logger: sqlalchemy.engine.Engine.modena
+        )
+        async_session_factory.configure(bind=_engine)
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """
+    Closes every pooled connection and forgets the engine (used on shutdown).
+    """
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
 
 # ─────────────────────────────────────────────────────────────────────────────────
-# SESSION FACTORY
+# SESSION FACTORY + REGISTRY
 # ─────────────────────────────────────────────────────────────────────────────────
-# SessionLocal is a FACTORY - call it to create new database sessions.
-# Each API request gets its own session (isolated transactions).
+# async_session_factory is a FACTORY - call it to create new database sessions.
+#
+# AsyncSessionLocal is a REGISTRY on top of the factory (a "scoped session").
+# Calling it returns THE session for the current asyncio task, creating it
+# only the first time. Each API request runs in its own task, so each request
+# still gets its own session (isolated transactions), but anything in that
+# request that asks for a session gets the same one back instead of a new one.
+#
+# WHY current_task and not threads?
+# Classic scoped_session is keyed per THREAD. We're async - many requests
+# share one thread - so we key per TASK instead.
+
+async_session_factory = async_sessionmaker(
+    autocommit=False,        # We control when to commit
+    autoflush=False,         # We control when to flush
+    expire_on_commit=False,  # Keep loaded values after commit (no lazy reload in async)
+    # bind is set by get_engine() when the engine is first created
+)
 
-SessionLocal = sessionmaker(
-    autocommit=False,  # We control when to commit
-    autoflush=False,   # We control when to flush
-    bind=engine,       # Use our engine
+AsyncSessionLocal = async_scoped_session(
+    async_session_factory,
+    scopefunc=current_task,
 )
 
 # ─────────────────────────────────────────────────────────────────────────────────
@@ -75,22 +136,23 @@ Base = declarative_base()
 # This is a "dependency" that FastAPI injects into route functions.
 # It ensures every request gets a session, and it's closed when done.
 
-def get_db():
+async def get_db():
     """
     Dependency that provides a database session to FastAPI routes.
     
     Usage in a route:
         @app.get("/domains")
-        def get_domains(db: Session = Depends(get_db)):
-            return db.query(Domain).all()
+        async def get_domains(db: AsyncSession = Depends(get_db)):
+            result = await db.execute(select(Domain))
+            return result.scalars().all()
     
     The 'yield' makes this a generator:
-    1. Before yield: create session
+    1. Before yield: get this request's session from the registry
     2. yield: route function runs with the session
-    3. After yield (finally): close session
+    3. After yield (finally): close session and drop it from the registry
     """
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        await AsyncSessionLocal.remove()
\ No newline at end of file
@@ -30,8 +30,7 @@
 #  DynamoDB is better for simple key-value lookups like Terraform state locking."
 # ═══════════════════════════════════════════════════════════════════════════════
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, Index, text, func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -49,12 +48,23 @@ class Domain(Base):
     domain_name = Column(String(255), unique=True, index=True, nullable=False)
     # WHY index=True? Fast lookups when searching by domain name
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps come from PostgreSQL's clock (NOW()), not the pod's:
+    # - default/onupdate=func.now() → SQLAlchemy writes NOW() into the INSERT/UPDATE
+    #   (works on tables created before server defaults existed)
+    # - server_default=func.now()   → DEFAULT NOW() in CREATE TABLE for new tables
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True)
     
     # Relationship: One domain has many scans
     scans = relationship("Scan", back_populates="domain", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # PARTIAL index: only active domains are in it.
+        # Backs list_domains (WHERE is_active = true ... OFFSET/LIMIT) so
+        # Postgres walks just the rows it needs instead of filtering the table.
+        Index("ix_domains_active", "id", postgresql_where=text("is_active = true")),
+    )
 
 
 class Scan(Base):
@@ -69,7 +79,7 @@ class Scan(Base):
     id = Column(Integer, primary_key=True, index=True)
     domain_id = Column(Integer, ForeignKey("domains.id"), nullable=False)
     
-    started_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, default=func.now(), server_default=func.now())  # DB clock, see Domain
     completed_at = Column(DateTime, nullable=True)
     status = Column(String(50), default="pending")  # pending, running, completed, failed
     error_message = Column(Text, nullable=True)
@@ -79,6 +89,12 @@ class Scan(Base):
     dns_records = relationship("DNSRecord", back_populates="scan", cascade="all, delete-orphan")
     whois_data = relationship("WhoisData", back_populates="scan", uselist=False, cascade="all, delete-orphan")
     subdomains = relationship("Subdomain", back_populates="scan", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Backs list_scans (ORDER BY started_at DESC) - newest scans are read
+        # straight off the index, no sort step.
+        Index("ix_scans_started_desc", started_at.desc()),
+    )
 
 
 class DNSRecord(Base):
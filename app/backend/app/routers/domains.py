@@ -22,8 +22,9 @@
 # Same code organization principle!
 # ═══════════════════════════════════════════════════════════════════════════════
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.database import get_db
@@ -37,10 +38,10 @@ router = APIRouter(
 
 
 @router.get("", response_model=DomainList)
-def list_domains(
+async def list_domains(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all domains.
@@ -49,16 +50,45 @@ def list_domains(
     - skip: Number of records to skip (pagination)
     - limit: Max records to return
     """
-    domains = db.query(Domain).filter(Domain.is_active == True).offset(skip).limit(limit).all()
-    total = db.query(Domain).filter(Domain.is_active == True).count()
+    # ONE query for the page AND the total:
+    # COUNT(*) OVER () is a window function - Postgres counts all matching rows
+    # (before OFFSET/LIMIT) and attaches that number to every returned row.
+    # ORDER BY id → stable pages, read in the order of the partial index
+    # ix_domains_active (see models.py).
+    result = await db.execute(
+        select(Domain, func.count().over().label("total"))
+        .where(Domain.is_active == True)
+        .order_by(Domain.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = result.all()
+    domains = [row[0] for row in rows]
     
-    return DomainList(domains=domains, total=total)
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # Page past the end has no rows to carry the count - ask directly
+        total = await db.scalar(
+            select(func.count()).select_from(Domain).where(Domain.is_active == True)
+        )
+    else:
+        total = 0
+    
+    # Rows come from our own DB - build the response without re-validating it.
+    # Returning a Response directly also skips FastAPI's response_model pass
+    # (response_model= is still used for the /docs schema).
+    body = DomainList.model_construct(
+        domains=[DomainResponse.from_orm_fast(d) for d in domains],
+        total=total,
+    )
+    return Response(body.model_dump_json(), media_type="application/json")
 
 
 @router.post("", response_model=DomainResponse, status_code=status.HTTP_201_CREATED)
-def create_domain(
+async def create_domain(
     domain_data: DomainCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Add a new domain to scan.
@@ -69,7 +99,10 @@ def create_domain(
     }
     """
     # Check if domain already exists
-    existing = db.query(Domain).filter(Domain.domain_name == domain_data.domain_name).first()
+    # Only fetch the id - we just need to know if a row exists
+    existing = await db.scalar(
+        select(Domain.id).where(Domain.domain_name == domain_data.domain_name)
+    )
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -77,40 +110,48 @@ def create_domain(
         )
     
     # Create new domain
-    domain = Domain(domain_name=domain_data.domain_name.lower())
+    # domain_name is already normalized (lowercase, punycode) by DomainCreate
+    domain = Domain(domain_name=domain_data.domain_name)
     db.add(domain)
-    db.commit()
-    db.refresh(domain)
+    await db.commit()  # id + created_at come back via INSERT ... RETURNING
     
-    return domain
+    return Response(
+        DomainResponse.from_orm_fast(domain).model_dump_json(),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
 
 
 @router.get("/{domain_id}", response_model=DomainResponse)
-def get_domain(
+async def get_domain(
     domain_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get a specific domain by ID.
     """
-    domain = db.query(Domain).filter(Domain.id == domain_id).first()
+    # db.get() is the primary-key fast path (checks the session first)
+    domain = await db.get(Domain, domain_id)
     if not domain:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Domain with id {domain_id} not found"
         )
-    return domain
+    return Response(
+        DomainResponse.from_orm_fast(domain).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.delete("/{domain_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_domain(
+async def delete_domain(
     domain_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a domain (soft delete - sets is_active=False).
     """
-    domain = db.query(Domain).filter(Domain.id == domain_id).first()
+    domain = await db.get(Domain, domain_id)
     if not domain:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -119,6 +160,6 @@ def delete_domain(
     
     # Soft delete
     domain.is_active = False
-    db.commit()
+    await db.commit()
     
     return None
\ No newline at end of file
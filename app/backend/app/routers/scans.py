@@ -14,23 +14,33 @@
 # 1. POST /api/scans {"domain_name": "google.com"}
 # 2. Backend creates Domain if not exists
 # 3. Backend creates Scan record (status: running)
-# 4. Backend runs scrapers (DNS, WHOIS, subdomains)
-# 5. Backend saves results to database
-# 6. Backend updates Scan (status: completed)
-# 7. Returns scan results
+# 4. Returns the scan right away (202 Accepted)
+# --- in the background ---
+# 5. Backend runs scrapers (DNS, WHOIS, subdomains) CONCURRENTLY
+# 6. Backend saves results to database
+# 7. Backend updates Scan (status: completed)
+# 8. Client polls GET /api/scans/{id} for the results
 #
 # THIS IS YOUR APP'S MAIN FUNCTIONALITY!
 # ═══════════════════════════════════════════════════════════════════════════════
 
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+import asyncio
+from collections import OrderedDict
+from fastapi import APIRouter, Depends, HTTPException, Response, status, BackgroundTasks
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, joinedload
 from typing import List
 
-from app.database import get_db
+from app.database import get_db, async_session_factory
 from app.models import Domain, Scan, DNSRecord, WhoisData, Subdomain
-from app.schemas import ScanCreate, ScanResponse, ScanResultResponse
-from app.scrapers import scan_dns_records, scan_whois, scan_subdomains
+from app.schemas import (
+    ScanCreate, ScanResponse, ScanResultResponse,
+    DomainResponse, DNSRecordResponse, WhoisResponse, SubdomainResponse,
+    SCAN_LIST_ADAPTER,
+)
+from app import scrapers  # Scraper modules load on first scan (see scrapers/__init__.py)
 
 import logging
 
@@ -41,17 +51,73 @@ router = APIRouter(
     tags=["scans"],
 )
 
+# ─────────────────────────────────────────────────────────────────────────────────
+# DOMAIN ID CACHE
+# ─────────────────────────────────────────────────────────────────────────────────
+# Remembers domain_name → domain.id for domains this worker has already seen,
+# so a repeat scan loads the domain by PRIMARY KEY (db.get) instead of
+# searching by name. It's an LRU with a hard size cap so it can't grow forever.
+# Each worker process has its own copy - that's fine, it's only a shortcut.
+_DOMAIN_ID_CACHE: "OrderedDict[str, int]" = OrderedDict()
+_DOMAIN_ID_CACHE_MAXSIZE = 1024
+
+
+def _remember_domain_id(domain_name: str, domain_id: int) -> None:
+    """Store a domain id, evicting the least recently used entry if full."""
+    _DOMAIN_ID_CACHE[domain_name] = domain_id
+    _DOMAIN_ID_CACHE.move_to_end(domain_name)
+    if len(_DOMAIN_ID_CACHE) > _DOMAIN_ID_CACHE_MAXSIZE:
+        _DOMAIN_ID_CACHE.popitem(last=False)
+
+
+async def _get_or_create_domain_id(db: AsyncSession, domain_name: str) -> int:
+    """
+    Get-or-create a domain in ONE statement (an "upsert").
+    
+    INSERT ... ON CONFLICT (domain_name) DO NOTHING RETURNING id
+    
+    - New domain → the INSERT returns its id
+    - Existing domain → nothing is inserted, so we look the id up
+    
+    Unlike "SELECT, then INSERT if missing", two scans of the same new
+    domain at the same time can't both try to insert it (IntegrityError).
+    """
+    stmt = (
+        pg_insert(Domain)
+        .values(domain_name=domain_name)
+        .on_conflict_do_nothing(index_elements=[Domain.domain_name])
+        .returning(Domain.id)
+    )
+    domain_id = await db.scalar(stmt)
+    if domain_id is not None:
+        logger.info(f"Created new domain: {domain_name}")
+        return domain_id
+    
+    return await db.scalar(select(Domain.id).where(Domain.domain_name == domain_name))
+
 
-@router.post("", response_model=ScanResultResponse, status_code=status.HTTP_201_CREATED)
-def create_scan(
+async def _none():
+    """Placeholder for a skipped WHOIS scan."""
+    return None
+
+
+async def _empty():
+    """Placeholder for a skipped subdomain scan."""
+    return []
+
+
+@router.post("", response_model=ScanResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_scan(
     scan_data: ScanCreate,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Start a new scan for a domain.
     
-    This is SYNCHRONOUS - waits for scan to complete.
-    For production, you'd want this to be async (return scan ID, poll for results).
+    Returns IMMEDIATELY with the new scan (status: running). The scrapers run
+    in the background - poll GET /api/scans/{id} until status is
+    "completed" or "failed" to get the results.
     
     Request body:
     {
@@ -60,59 +126,116 @@ def create_scan(
         "include_whois": true
     }
     """
-    domain_name = scan_data.domain_name.lower()
+    domain_name = scan_data.domain_name  # Already normalized by ScanCreate
     logger.info(f"Starting scan for {domain_name}")
     
     # ─────────────────────────────────────────────────────────────────────────
-    # STEP 1: Get or create domain
+    # STEP 1: Get or create domain (we only need its id)
     # ─────────────────────────────────────────────────────────────────────────
-    domain = db.query(Domain).filter(Domain.domain_name == domain_name).first()
-    if not domain:
-        domain = Domain(domain_name=domain_name)
-        db.add(domain)
-        db.commit()
-        db.refresh(domain)
-        logger.info(f"Created new domain: {domain_name}")
+    domain_id = _DOMAIN_ID_CACHE.get(domain_name)
+    if domain_id is not None:
+        if await db.get(Domain, domain_id) is None:
+            # Row is gone - forget it and fall back to the upsert
+            _DOMAIN_ID_CACHE.pop(domain_name, None)
+            domain_id = None
+    
+    if domain_id is None:
+        domain_id = await _get_or_create_domain_id(db, domain_name)
+    
+    _remember_domain_id(domain_name, domain_id)
     
     # ─────────────────────────────────────────────────────────────────────────
     # STEP 2: Create scan record
     # ─────────────────────────────────────────────────────────────────────────
     scan = Scan(
-        domain_id=domain.id,
-        status="running"
+        domain_id=domain_id,
+        status="running"  # Background work starts as soon as we respond
     )
     db.add(scan)
-    db.commit()
-    db.refresh(scan)
+    # No refresh() needed: the INSERT uses RETURNING, so the new id and the
+    # DB-generated started_at are already on the object after the flush.
+    await db.commit()
     logger.info(f"Created scan {scan.id} for {domain_name}")
     
+    # ─────────────────────────────────────────────────────────────────────────
+    # STEP 3: Hand the scan off to the background
+    # ─────────────────────────────────────────────────────────────────────────
+    # FastAPI runs this AFTER the response has been sent to the client.
+    background_tasks.add_task(
+        _run_scan,
+        scan.id,
+        domain_name,
+        scan_data.include_whois,
+        scan_data.include_subdomains,
+    )
+    
+    # Trusted row → schema without validation (see OrmResponse in schemas.py)
+    return Response(
+        ScanResponse.from_orm_fast(scan).model_dump_json(),
+        status_code=status.HTTP_202_ACCEPTED,
+        media_type="application/json",
+    )
+
+
+async def _run_scan(
+    scan_id: int,
+    domain_name: str,
+    include_whois: bool,
+    include_subdomains: bool,
+) -> None:
+    """
+    The scan pipeline: run scrapers, save results, mark scan done.
+    
+    Runs as a background task, so it opens its OWN session - the request's
+    session belongs to the request that already returned.
+    
+    ONE TRANSACTION: all results + the "completed" status are written together
+    in a single commit. Either the whole scan lands or none of it does, and
+    no database connection is held while the scrapers wait on the network.
+    """
     try:
         # ─────────────────────────────────────────────────────────────────────
-        # STEP 3: Run DNS scan (always)
+        # STEP 4: Run DNS, WHOIS and subdomain scans at the same time
         # ─────────────────────────────────────────────────────────────────────
-        logger.info(f"Running DNS scan for {domain_name}")
-        dns_results = scan_dns_records(domain_name)
+        # DNS always runs; WHOIS and subdomains only if requested.
+        logger.info(f"Running scrapers for {domain_name}")
+        dns_results, whois_result, subdomain_results = await asyncio.gather(
+            scrapers.scan_dns_records(domain_name),
+            scrapers.scan_whois(domain_name) if include_whois else _none(),
+            scrapers.scan_subdomains(domain_name) if include_subdomains else _empty(),
+            return_exceptions=True,
+        )
         
-        for record in dns_results:
-            dns_record = DNSRecord(
-                scan_id=scan.id,
-                record_type=record["record_type"],
-                record_value=record["record_value"],
-                ttl=record.get("ttl"),
-                priority=record.get("priority"),
-            )
-            db.add(dns_record)
+        # gather() hands exceptions back as results - re-raise the first one
+        for outcome in (dns_results, whois_result, subdomain_results):
+            if isinstance(outcome, BaseException):
+                raise outcome
         
-        # ─────────────────────────────────────────────────────────────────────
-        # STEP 4: Run WHOIS scan (if requested)
-        # ─────────────────────────────────────────────────────────────────────
-        if scan_data.include_whois:
-            logger.info(f"Running WHOIS scan for {domain_name}")
-            whois_result = scan_whois(domain_name)
+        # db.begin() commits when the block ends, or rolls back on error
+        async with async_session_factory() as db, db.begin():
+            # ─────────────────────────────────────────────────────────────────
+            # STEP 5: Save DNS records
+            # ─────────────────────────────────────────────────────────────────
+            # One bulk INSERT for all rows instead of one ORM object per row.
+            dns_records = [
+                {
+                    "scan_id": scan_id,
+                    "record_type": record["record_type"],
+                    "record_value": record["record_value"],
+                    "ttl": record.get("ttl"),
+                    "priority": record.get("priority"),
+                }
+                for record in dns_results
+            ]
+            if dns_records:
+                await db.execute(insert(DNSRecord), dns_records)
             
+            # ─────────────────────────────────────────────────────────────────
+            # STEP 6: Save WHOIS data (if requested and found)
+            # ─────────────────────────────────────────────────────────────────
             if whois_result:
                 whois_data = WhoisData(
-                    scan_id=scan.id,
+                    scan_id=scan_id,
                     registrar=whois_result.get("registrar"),
                     creation_date=whois_result.get("creation_date"),
                     expiration_date=whois_result.get("expiration_date"),
@@ -122,101 +245,109 @@ def create_scan(
                     raw_data=whois_result.get("raw_data"),
                 )
                 db.add(whois_data)
-        
-        # ─────────────────────────────────────────────────────────────────────
-        # STEP 5: Run subdomain scan (if requested)
-        # ─────────────────────────────────────────────────────────────────────
-        if scan_data.include_subdomains:
-            logger.info(f"Running subdomain scan for {domain_name}")
-            subdomain_results = scan_subdomains(domain_name)
             
-            for sub in subdomain_results:
-                subdomain = Subdomain(
-                    scan_id=scan.id,
-                    subdomain_name=sub["subdomain_name"],
-                    full_domain=sub["full_domain"],
-                    ip_address=sub.get("ip_address"),
-                    is_alive=sub.get("is_alive", False),
-                    http_status=sub.get("http_status"),
-                )
-                db.add(subdomain)
-        
-        # ─────────────────────────────────────────────────────────────────────
-        # STEP 6: Mark scan as completed
-        # ─────────────────────────────────────────────────────────────────────
-        scan.status = "completed"
-        scan.completed_at = datetime.utcnow()
-        db.commit()
+            # ─────────────────────────────────────────────────────────────────
+            # STEP 7: Save subdomains (if requested)
+            # ─────────────────────────────────────────────────────────────────
+            subdomains = [
+                {
+                    "scan_id": scan_id,
+                    "subdomain_name": sub["subdomain_name"],
+                    "full_domain": sub["full_domain"],
+                    "ip_address": sub.get("ip_address"),
+                    "is_alive": sub.get("is_alive", False),
+                    "http_status": sub.get("http_status"),
+                }
+                for sub in subdomain_results
+            ]
+            if subdomains:
+                await db.execute(insert(Subdomain), subdomains)
+            
+            # ─────────────────────────────────────────────────────────────────
+            # STEP 8: Mark scan as completed
+            # ─────────────────────────────────────────────────────────────────
+            await db.execute(
+                update(Scan)
+                .where(Scan.id == scan_id)
+                .values(status="completed", completed_at=func.now())
+            )
         
-        logger.info(f"Scan {scan.id} completed for {domain_name}")
+        logger.info(f"Scan {scan_id} completed for {domain_name}")
         
     except Exception as e:
         # ─────────────────────────────────────────────────────────────────────
         # Handle errors
         # ─────────────────────────────────────────────────────────────────────
-        logger.error(f"Scan {scan.id} failed: {str(e)}")
-        scan.status = "failed"
-        scan.error_message = str(e)
-        scan.completed_at = datetime.utcnow()
-        db.commit()
-        
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Scan failed: {str(e)}"
-        )
-    
-    # ─────────────────────────────────────────────────────────────────────────
-    # STEP 7: Refresh and return results
-    # ─────────────────────────────────────────────────────────────────────────
-    db.refresh(scan)
-    
-    return ScanResultResponse(
-        scan=scan,
-        domain=domain,
-        dns_records=scan.dns_records,
-        whois=scan.whois_data,
-        subdomains=scan.subdomains,
-    )
+        # Nobody is waiting on a response any more, so record the failure
+        # on the scan row - that's what the client sees when it polls.
+        # Any partial results were rolled back above; this is a fresh transaction.
+        logger.error(f"Scan {scan_id} failed: {str(e)}")
+        async with async_session_factory() as db, db.begin():
+            await db.execute(
+                update(Scan)
+                .where(Scan.id == scan_id)
+                .values(status="failed", error_message=str(e), completed_at=func.now())
+            )
 
 
 @router.get("/{scan_id}", response_model=ScanResultResponse)
-def get_scan(
+async def get_scan(
     scan_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get results of a specific scan.
     """
-    scan = db.query(Scan).filter(Scan.id == scan_id).first()
+    # Load the scan and ALL its results up front (async sessions can't
+    # lazy-load on attribute access anyway):
+    # - joinedload for one-to-one (domain, whois) → same SELECT via JOIN
+    # - selectinload for one-to-many (dns, subdomains) → one extra SELECT each,
+    #   avoids multiplying rows like a JOIN would
+    scan = await db.get(
+        Scan,
+        scan_id,
+        options=[
+            joinedload(Scan.domain),
+            joinedload(Scan.whois_data),
+            selectinload(Scan.dns_records),
+            selectinload(Scan.subdomains),
+        ],
+    )
     if not scan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Scan {scan_id} not found"
         )
     
-    return ScanResultResponse(
-        scan=scan,
-        domain=scan.domain,
-        dns_records=scan.dns_records,
-        whois=scan.whois_data,
-        subdomains=scan.subdomains,
+    # Everything here was written by _run_scan, so build the response with
+    # model_construct (no validation) and serialize it straight to JSON.
+    result = ScanResultResponse.model_construct(
+        scan=ScanResponse.from_orm_fast(scan),
+        domain=DomainResponse.from_orm_fast(scan.domain),
+        dns_records=[DNSRecordResponse.from_orm_fast(r) for r in scan.dns_records],
+        whois=WhoisResponse.from_orm_fast(scan.whois_data) if scan.whois_data else None,
+        subdomains=[SubdomainResponse.from_orm_fast(s) for s in scan.subdomains],
     )
+    return Response(result.model_dump_json(), media_type="application/json")
 
 
 @router.get("", response_model=List[ScanResponse])
-def list_scans(
+async def list_scans(
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all scans (most recent first).
     """
-    scans = (
-        db.query(Scan)
+    result = await db.execute(
+        select(Scan)
         .order_by(Scan.started_at.desc())
         .offset(skip)
         .limit(limit)
-        .all()
     )
-    return scans
\ No newline at end of file
+    scans = result.scalars().all()
+    return Response(
+        SCAN_LIST_ADAPTER.dump_json([ScanResponse.from_orm_fast(s) for s in scans]),
+        media_type="application/json",
+    )
\ No newline at end of file
@@ -26,7 +26,44 @@
 
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field
+import idna
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+
+
+def _normalize_domain_name(value):
+    """
+    Clean up a domain name ONCE, when the request is parsed.
+    
+    "  Google.COM. " → "google.com"
+    "münchen.de"     → "xn--mnchen-3ya.de" (punycode, what DNS actually uses)
+    
+    Invalid names raise ValueError → FastAPI returns 422 before any DB work.
+    """
+    if not isinstance(value, str):
+        return value  # Let Pydantic report the type error
+    value = value.strip().lower().rstrip(".")
+    try:
+        return idna.encode(value).decode("ascii")
+    except idna.IDNAError as e:
+        raise ValueError(f"Invalid domain name: {e}")
+
+
+# ─────────────────────────────────────────────────────────────────────────────────
+# TRUSTED RESPONSE BASE
+# ─────────────────────────────────────────────────────────────────────────────────
+# Response schemas are filled from rows WE wrote to our own database, so there's
+# nothing to validate. model_construct() just copies the attributes across,
+# which is many times faster than model_validate() on every row.
+# (Request bodies like DomainCreate/ScanCreate are untrusted - they still validate.)
+
+class OrmResponse(BaseModel):
+    """Base for response schemas built from SQLAlchemy objects."""
+    model_config = ConfigDict(from_attributes=True)  # Allows conversion from SQLAlchemy model
+    
+    @classmethod
+    def from_orm_fast(cls, obj):
+        """Build the schema from a trusted ORM object WITHOUT validation."""
+        return cls.model_construct(**{f: getattr(obj, f) for f in cls.model_fields})
 
 
 # ─────────────────────────────────────────────────────────────────────────────────
@@ -35,18 +72,17 @@ from pydantic import BaseModel, Field
 
 class DomainCreate(BaseModel):
     """Schema for creating a new domain."""
-    domain_name: str = Field(..., min_length=3, max_length=255, example="google.com")
+    domain_name: str = Field(..., min_length=3, max_length=255, json_schema_extra={"example": "google.com"})
+    
+    _normalize_domain = field_validator("domain_name", mode="before")(_normalize_domain_name)
 
 
-class DomainResponse(BaseModel):
+class DomainResponse(OrmResponse):
     """Schema for domain in API responses."""
     id: int
     domain_name: str
     created_at: datetime
     is_active: bool
-    
-    class Config:
-        from_attributes = True  # Allows conversion from SQLAlchemy model
 
 
 class DomainList(BaseModel):
@@ -59,22 +95,19 @@ class DomainList(BaseModel):
 # DNS RECORD SCHEMAS
 # ─────────────────────────────────────────────────────────────────────────────────
 
-class DNSRecordResponse(BaseModel):
+class DNSRecordResponse(OrmResponse):
     """Schema for DNS record in API responses."""
     record_type: str
     record_value: str
     ttl: Optional[int] = None
     priority: Optional[int] = None
-    
-    class Config:
-        from_attributes = True
 
 
 # ─────────────────────────────────────────────────────────────────────────────────
 # WHOIS SCHEMAS
 # ─────────────────────────────────────────────────────────────────────────────────
 
-class WhoisResponse(BaseModel):
+class WhoisResponse(OrmResponse):
     """Schema for WHOIS data in API responses."""
     registrar: Optional[str] = None
     creation_date: Optional[datetime] = None
@@ -82,25 +115,19 @@ class WhoisResponse(BaseModel):
     updated_date: Optional[datetime] = None
     name_servers: Optional[List[str]] = None
     registrant_country: Optional[str] = None
-    
-    class Config:
-        from_attributes = True
 
 
 # ─────────────────────────────────────────────────────────────────────────────────
 # SUBDOMAIN SCHEMAS
 # ─────────────────────────────────────────────────────────────────────────────────
 
-class SubdomainResponse(BaseModel):
+class SubdomainResponse(OrmResponse):
     """Schema for subdomain in API responses."""
     subdomain_name: str
     full_domain: str
     ip_address: Optional[str] = None
     is_alive: bool
     http_status: Optional[int] = None
-    
-    class Config:
-        from_attributes = True
 
 
 # ─────────────────────────────────────────────────────────────────────────────────
@@ -112,9 +139,11 @@ class ScanCreate(BaseModel):
     domain_name: str = Field(..., min_length=3, max_length=255)
     include_subdomains: bool = True
     include_whois: bool = True
+    
+    _normalize_domain = field_validator("domain_name", mode="before")(_normalize_domain_name)
 
 
-class ScanResponse(BaseModel):
+class ScanResponse(OrmResponse):
     """Schema for scan in API responses."""
     id: int
     domain_id: int
@@ -122,9 +151,6 @@ class ScanResponse(BaseModel):
     completed_at: Optional[datetime] = None
     status: str
     error_message: Optional[str] = None
-    
-    class Config:
-        from_attributes = True
 
 
 class ScanResultResponse(BaseModel):
@@ -136,6 +162,17 @@ class ScanResultResponse(BaseModel):
     subdomains: List[SubdomainResponse]
 
 
+# ─────────────────────────────────────────────────────────────────────────────────
+# LIST ADAPTERS
+# ─────────────────────────────────────────────────────────────────────────────────
+# A bare List[ScanResponse] isn't a model, so it has no model_dump_json().
+# A TypeAdapter compiles the list schema ONCE (at import) and then handles the
+# whole list in one call, instead of a Python loop doing one row at a time.
+# (dns_records/subdomains don't need one: they're fields of ScanResultResponse,
+#  so its serializer already walks those lists in a single pass.)
+SCAN_LIST_ADAPTER = TypeAdapter(List[ScanResponse])
+
+
 # ─────────────────────────────────────────────────────────────────────────────────
 # HEALTH CHECK
 # ─────────────────────────────────────────────────────────────────────────────────
@@ -145,4 +182,5 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     environment: str
-    database_connected: bool
\ No newline at end of file
+    database_connected: bool
+
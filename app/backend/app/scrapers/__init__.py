@@ -3,10 +3,33 @@
 # ═══════════════════════════════════════════════════════════════════════════════
 # This makes the scrapers/ folder a Python package.
 # We export the main scraper functions for easy importing.
+#
+# WHY LAZY?
+# ─────────
+# The scraper modules pull in dnspython and httpx. Instead of importing them
+# all when the package is imported (worker boot), each name is imported the
+# first time someone asks for it (PEP 562 module __getattr__).
+# `from app.scrapers import scan_whois` still works exactly the same.
 # ═══════════════════════════════════════════════════════════════════════════════
 
-from app.scrapers.dns import scan_dns_records
-from app.scrapers.whois import scan_whois
-from app.scrapers.subdomains import scan_subdomains
+from importlib import import_module
 
-__all__ = ["scan_dns_records", "scan_whois", "scan_subdomains"]
\ No newline at end of file
+# public name → module that defines it
+_EXPORTS = {
+    "scan_dns_records": "app.scrapers.dns",
+    "get_resolver": "app.scrapers.dns",
+    "scan_whois": "app.scrapers.whois",
+    "close_rdap_client": "app.scrapers.whois",
+    "scan_subdomains": "app.scrapers.subdomains",
+}
+
+__all__ = ["scan_dns_records", "scan_whois", "scan_subdomains", "get_resolver", "close_rdap_client"]
+
+
+def __getattr__(name):
+    """Import a scraper function on first access, then keep it on the package."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value  # Next access is a normal attribute lookup
+    return value
@@ -32,9 +32,12 @@
 #  TXT records are used for SPF/DKIM email authentication and domain verification."
 # ═══════════════════════════════════════════════════════════════════════════════
 
+import asyncio
+import dns.asyncresolver
 import dns.resolver
 import dns.exception
-from typing import List, Dict, Any
+import dns.message
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import logging
 
 from app.config import get_settings
@@ -43,15 +46,55 @@ settings = get_settings()
 logger = logging.getLogger(__name__)
 
 # DNS record types to query
-RECORD_TYPES = ["A", "AAAA", "MX", "TXT", "NS", "CNAME", "SOA"]
+RECORD_TYPES = ("A", "AAAA", "MX", "TXT", "NS", "CNAME", "SOA")
 
 
-def scan_dns_records(domain: str) -> List[Dict[str, Any]]:
+# Max answers the shared resolver cache holds (one per name + record type)
+DNS_CACHE_SIZE = 10000
+
+# The ONE resolver for this worker process (created on first use)
+_RESOLVER: Optional[dns.asyncresolver.Resolver] = None
+
+
+def get_resolver() -> dns.asyncresolver.Resolver:
+    """
+    Return the DNS resolver shared by ALL scans in this worker.
+    
+    Built once, then reused, so /etc/resolv.conf is read once and the answer
+    cache is shared: the same name queried by the DNS and subdomain scanners,
+    or by two scans running at once, only goes over the wire once (until its
+    TTL runs out). main.py builds it during startup (lifespan warmup).
+    """
+    global _RESOLVER
+    if _RESOLVER is None:
+        resolver = dns.asyncresolver.Resolver()
+        # timeout  = how long to wait on ONE nameserver before trying the next
+        # lifetime = total budget for the whole query (all retries)
+        # A quarter of the budget per attempt → a dead nameserver costs 1/4 of
+        # the budget instead of all of it, and there's time left to retry.
+        resolver.timeout = settings.scraper_timeout / 4
+        resolver.lifetime = settings.scraper_timeout
+        # EDNS0: tell servers we accept UDP answers bigger than 512 bytes, so
+        # large TXT/DKIM answers aren't truncated and retried over TCP.
+        # 1232 bytes is the DNS Flag Day 2020 size (no IP fragmentation).
+        resolver.use_edns(0, 0, dns.message.DEFAULT_EDNS_PAYLOAD)
+        # Remembers answers for their TTL, capped at DNS_CACHE_SIZE entries
+        # (least recently used answers are dropped first)
+        resolver.cache = dns.resolver.LRUCache(max_size=DNS_CACHE_SIZE)
+        _RESOLVER = resolver
+    return _RESOLVER
+
+
+async def scan_dns_records(
+    domain: str,
+    resolver: Optional[dns.asyncresolver.Resolver] = None,
+) -> List[Dict[str, Any]]:
     """
     Scan all DNS record types for a domain.
     
     Args:
         domain: The domain to scan (e.g., "google.com")
+        resolver: Resolver to use (defaults to the shared get_resolver())
     
     Returns:
         List of DNS records found, each with:
@@ -66,82 +109,123 @@ def scan_dns_records(domain: str) -> List[Dict[str, Any]]:
             {"record_type": "MX", "record_value": "mail.google.com", "ttl": 600, "priority": 10},
         ]
     """
-    results = []
+    resolver = resolver or get_resolver()
     
-    # Configure resolver with timeout
-    resolver = dns.resolver.Resolver()
-    resolver.timeout = settings.scraper_timeout
-    resolver.lifetime = settings.scraper_timeout
+    # Fire all 7 record-type queries at once: total time ≈ the slowest query,
+    # not the sum of all 7.
+    queries = [
+        asyncio.ensure_future(_query_record_type(resolver, domain, record_type))
+        for record_type in RECORD_TYPES
+    ]
     
-    for record_type in RECORD_TYPES:
-        try:
-            # Query DNS for this record type
-            answers = resolver.resolve(domain, record_type)
-            
-            for rdata in answers:
-                record = {
-                    "record_type": record_type,
-                    "record_value": _extract_record_value(rdata, record_type),
-                    "ttl": answers.ttl,
-                }
-                
-                # MX records have priority
-                if record_type == "MX":
-                    record["priority"] = rdata.preference
-                
-                results.append(record)
-                logger.debug(f"Found {record_type} record for {domain}: {record['record_value']}")
-                
-        except dns.resolver.NXDOMAIN:
-            # Domain doesn't exist
-            logger.warning(f"Domain {domain} does not exist (NXDOMAIN)")
-            break  # No point checking other record types
-            
-        except dns.resolver.NoAnswer:
-            # No records of this type (normal - not every domain has AAAA)
-            logger.debug(f"No {record_type} records for {domain}")
-            continue
-            
-        except dns.resolver.NoNameservers:
-            # No nameservers could answer
-            logger.warning(f"No nameservers available for {domain}")
-            continue
-            
-        except dns.exception.Timeout:
-            # Query timed out
-            logger.warning(f"Timeout querying {record_type} for {domain}")
-            continue
-            
-        except Exception as e:
-            # Catch-all for unexpected errors
-            logger.error(f"Error querying {record_type} for {domain}: {str(e)}")
-            continue
+    try:
+        per_type = await asyncio.gather(*queries)
+        
+    except dns.resolver.NXDOMAIN:
+        # Domain doesn't exist
+        logger.warning(f"Domain {domain} does not exist (NXDOMAIN)")
+        for query in queries:
+            query.cancel()  # No point waiting on the other record types
+        return []
+    
+    # Flatten, keeping RECORD_TYPES order
+    results = [record for records in per_type for record in records]
     
     logger.info(f"DNS scan complete for {domain}: found {len(results)} records")
     return results
 
 
-def _extract_record_value(rdata, record_type: str) -> str:
+async def _query_record_type(
+    resolver: dns.asyncresolver.Resolver,
+    domain: str,
+    record_type: str,
+) -> List[Dict[str, Any]]:
     """
-    Extract the string value from a DNS record.
+    Query ONE record type. Returns [] on the normal "nothing here" errors.
     
-    Different record types have different structures:
-    - A/AAAA: Just the IP address
-    - MX: The mail server hostname
-    - TXT: The text content (may be multiple strings)
-    - NS/CNAME: The hostname
-    - SOA: Primary NS + admin email
+    NXDOMAIN is re-raised so scan_dns_records can stop the other queries.
     """
-    if record_type == "MX":
-        return str(rdata.exchange).rstrip(".")
-    
-    elif record_type == "TXT":
-        # TXT records can be multiple strings, join them
-        return "".join([s.decode() if isinstance(s, bytes) else s for s in rdata.strings])
+    results = []
+    # Pick the value extractor ONCE for this record type, not per record
+    extract = _VALUE_EXTRACTORS.get(record_type, _extract_default)
     
-    elif record_type == "SOA":
-        return f"{rdata.mname} {rdata.rname} (serial: {rdata.serial})"
+    try:
+        # Query DNS for this record type
+        answers = await resolver.resolve(domain, record_type)
+        
+        for rdata in answers:
+            value = extract(rdata)
+            
+            # MX extractor returns (hostname, priority)
+            if isinstance(value, tuple):
+                value, priority = value
+                record = {"record_type": record_type, "record_value": value,
+                          "ttl": answers.ttl, "priority": priority}
+            else:
+                record = {"record_type": record_type, "record_value": value,
+                          "ttl": answers.ttl}
+            
+            results.append(record)
+            logger.debug(f"Found {record_type} record for {domain}: {record['record_value']}")
+            
+    except dns.resolver.NXDOMAIN:
+        raise
+        
+    except dns.resolver.NoAnswer:
+        # No records of this type (normal - not every domain has AAAA)
+        logger.debug(f"No {record_type} records for {domain}")
+        
+    except dns.resolver.NoNameservers:
+        # No nameservers could answer
+        logger.warning(f"No nameservers available for {domain}")
+        
+    except dns.exception.Timeout:
+        # Query timed out
+        logger.warning(f"Timeout querying {record_type} for {domain}")
+        
+    except Exception as e:
+        # Catch-all for unexpected errors
+        logger.error(f"Error querying {record_type} for {domain}: {str(e)}")
     
-    else:
-        # A, AAAA, NS, CNAME - just convert to string
-        return str(rdata).rstrip(".")
\ No newline at end of file
+    return results
+
+
+# ─────────────────────────────────────────────────────────────────────────────────
+# VALUE EXTRACTORS
+# ─────────────────────────────────────────────────────────────────────────────────
+# Different record types have different structures:
+# - A/AAAA: Just the IP address
+# - MX: The mail server hostname (+ priority)
+# - TXT: The text content (may be multiple strings)
+# - NS/CNAME: The hostname
+# - SOA: Primary NS + admin email
+#
+# One small function per type, looked up in a dict built once at import.
+
+def _extract_mx(rdata) -> Tuple[str, int]:
+    return str(rdata.exchange).rstrip("."), rdata.preference
+
+
+def _extract_txt(rdata) -> str:
+    # TXT records can be multiple strings (long SPF/DKIM values are split into
+    # 255-byte chunks). Join the raw bytes first, then decode ONCE.
+    # "replace" → a stray invalid byte can't throw away the whole record.
+    return b"".join(
+        s if isinstance(s, bytes) else s.encode() for s in rdata.strings
+    ).decode("utf-8", "replace")
+
+
+def _extract_soa(rdata) -> str:
+    return f"{rdata.mname} {rdata.rname} (serial: {rdata.serial})"
+
+
+def _extract_default(rdata) -> str:
+    # A, AAAA, NS, CNAME - just convert to string
+    return str(rdata).rstrip(".")
+
+
+_VALUE_EXTRACTORS: Dict[str, Callable[[Any], Union[str, Tuple[str, int]]]] = {
+    "MX": _extract_mx,
+    "TXT": _extract_txt,
+    "SOA": _extract_soa,
+}
@@ -1,12 +1,122 @@
-# subdomains.py - Subdomain scanner (stub for now)
+# ═══════════════════════════════════════════════════════════════════════════════
+# MODENA SCRAPERS - SUBDOMAIN ENUMERATION
+# ═══════════════════════════════════════════════════════════════════════════════
+#
+# WHY THIS FILE?
+# ──────────────
+# Finds subdomains of a domain: www.google.com, mail.google.com, api.google.com
+# Forgotten subdomains are a classic attack surface (old admin panels, staging).
+#
+# HOW IT WORKS:
+# ─────────────
+# 1. Take the list of common subdomain names from settings
+# 2. Build full names: "www" + "google.com" → "www.google.com"
+# 3. Try to resolve each one (A record)
+# 4. If it resolves, the subdomain exists
+#
+# WHY CONCURRENT?
+# ───────────────
+# Checking 22 subdomains one after another = 22 network round-trips in a row.
+# With asyncio.gather() they all go out at once, so the whole scan takes
+# about as long as the SLOWEST lookup instead of the SUM of all lookups.
+# A semaphore caps how many queries are in flight at the same time.
+#
+# INTERVIEW TIP:
+# ──────────────
+# "Subdomain enumeration is I/O-bound, not CPU-bound. I fan the lookups out
+#  with asyncio and bound the concurrency with a semaphore so we don't flood
+#  the resolver."
+# ═══════════════════════════════════════════════════════════════════════════════
 
-async def scan_subdomains(domain: str) -> dict:
+import asyncio
+import dns.asyncresolver
+import dns.resolver
+import dns.exception
+from typing import List, Dict, Any, Optional
+import logging
+
+from app.config import get_settings
+from app.scrapers.dns import get_resolver
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Max DNS queries in flight at once for a single scan
+MAX_CONCURRENT_LOOKUPS = 32
+
+
+async def scan_subdomains(
+    domain: str,
+    resolver: Optional[dns.asyncresolver.Resolver] = None,
+) -> List[Dict[str, Any]]:
     """
-    Scan for subdomains of a given domain.
-    TODO: Implement actual subdomain enumeration
+    Scan for common subdomains of a domain.
+
+    Args:
+        domain: The domain to scan (e.g., "google.com")
+        resolver: Resolver to use (defaults to the shared get_resolver() in dns.py)
+
+    Returns:
+        List of subdomains that resolved, each with:
+        - subdomain_name: www, mail, api, etc.
+        - full_domain: www.google.com
+        - ip_address: First resolved IPv4 address
+        - is_alive: True (it resolved)
+
+    Example output:
+        [
+            {"subdomain_name": "www", "full_domain": "www.google.com",
+             "ip_address": "142.250.80.36", "is_alive": True},
+        ]
     """
+    resolver = resolver or get_resolver()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+    async def check(subdomain_name: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await _resolve_subdomain(resolver, subdomain_name, domain)
+
+    # Fire all lookups concurrently
+    lookups = await asyncio.gather(
+        *[check(sub) for sub in settings.common_subdomains]
+    )
+    results = [sub for sub in lookups if sub is not None]
+
+    logger.info(f"Subdomain scan complete for {domain}: found {len(results)} subdomains")
+    return results
+
+
+async def _resolve_subdomain(
+    resolver: dns.asyncresolver.Resolver,
+    subdomain_name: str,
+    domain: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Resolve one subdomain. Returns None if it doesn't exist.
+    """
+    full_domain = f"{subdomain_name}.{domain}"
+
+    try:
+        answers = await resolver.resolve(full_domain, "A")
+
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        # Subdomain doesn't exist (the normal case for most names)
+        return None
+
+    except (dns.resolver.NoNameservers, dns.exception.Timeout):
+        logger.debug(f"Lookup failed for {full_domain}")
+        return None
+
+    except Exception as e:
+        logger.error(f"Error resolving {full_domain}: {str(e)}")
+        return None
+
+    ip_address = str(answers[0]) if len(answers) else None
+    logger.debug(f"Found subdomain {full_domain}: {ip_address}")
+
     return {
-        "domain": domain,
-        "subdomains": [],
-        "status": "not_implemented"
-    }
\ No newline at end of file
+        "subdomain_name": subdomain_name,
+        "full_domain": full_domain,
+        "ip_address": ip_address,
+        "is_alive": True,
+    }
@@ -11,12 +11,18 @@
 # - Name servers
 # - Registrant info (often hidden for privacy)
 #
-# HOW WHOIS WORKS:
-# ────────────────
-# 1. Each TLD (.com, .org, .io) has WHOIS servers
-# 2. Query goes to appropriate WHOIS server
-# 3. Server returns registration data
-# 4. python-whois parses the messy text response
+# HOW WE LOOK IT UP (RDAP):
+# ──────────────────────────
+# Classic WHOIS returns free-form text that every registry formats
+# differently (slow, fragile regex parsing). RDAP is its modern replacement:
+# same data, but over HTTPS as structured JSON.
+# 1. GET https://rdap.org/domain/google.com
+# 2. rdap.org redirects to the RDAP server of the right registry (.com → Verisign)
+# 3. Registry returns JSON: events (dates), entities (registrar), nameservers
+# 4. orjson decodes it, we map the fields we store
+#
+# httpx.AsyncClient awaits the network, so WHOIS runs at the same time as
+# the DNS and subdomain scans without blocking the event loop.
 #
 # USE CASES:
 # ──────────
@@ -32,9 +38,11 @@
 #  an expired domain could be registered by attackers (domain hijacking)."
 # ═══════════════════════════════════════════════════════════════════════════════
 
-import whois
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import re
+import httpx
+import orjson
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from datetime import datetime, timezone
 import logging
 
 from app.config import get_settings
@@ -42,10 +50,46 @@ from app.config import get_settings
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Public RDAP bootstrap service - redirects to the registry's own RDAP server
+RDAP_URL = "https://rdap.org/domain/{domain}"
+
+
+# The ONE HTTP client for this worker process (created on first use)
+_RDAP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_rdap_client() -> httpx.AsyncClient:
+    """
+    Return the RDAP HTTP client shared by ALL scans in this worker.
+    
+    Like get_resolver() in dns.py: built once, then reused.
+    Creating a client builds a fresh SSL context (blocking CPU work on the
+    event loop), and a shared client keeps connections (keep-alive + TLS
+    sessions) open to rdap.org and the registry servers it redirects to.
+    main.py closes it on shutdown (close_rdap_client).
+    """
+    global _RDAP_CLIENT
+    if _RDAP_CLIENT is None:
+        _RDAP_CLIENT = httpx.AsyncClient(
+            timeout=settings.scraper_timeout,
+            follow_redirects=True,  # Follow the bootstrap redirect to the registry
+        )
+    return _RDAP_CLIENT
+
+
+async def close_rdap_client() -> None:
+    """
+    Close the shared RDAP client (call on app shutdown).
+    """
+    global _RDAP_CLIENT
+    if _RDAP_CLIENT is not None:
+        await _RDAP_CLIENT.aclose()
+        _RDAP_CLIENT = None
+
 
-def scan_whois(domain: str) -> Optional[Dict[str, Any]]:
+async def scan_whois(domain: str) -> Optional[Dict[str, Any]]:
     """
-    Perform WHOIS lookup for a domain.
+    Perform WHOIS (RDAP) lookup for a domain.
     
     Args:
         domain: The domain to lookup (e.g., "google.com")
@@ -61,35 +105,44 @@ def scan_whois(domain: str) -> Optional[Dict[str, Any]]:
             "updated_date": datetime(2019, 9, 9),
             "name_servers": ["ns1.google.com", "ns2.google.com"],
             "registrant_country": "US",
-            "raw_data": "... full WHOIS response ..."
+            "raw_data": "... full RDAP JSON response ..."
         }
     """
     try:
         logger.info(f"Starting WHOIS lookup for {domain}")
         
-        # Perform WHOIS lookup
-        w = whois.whois(domain)
+        # Perform RDAP lookup (the shared client follows the bootstrap redirect)
+        response = await get_rdap_client().get(
+            RDAP_URL.format(domain=domain),
+            headers={"Accept": "application/rdap+json"},
+        )
         
         # Handle case where domain doesn't exist
-        if w.domain_name is None:
+        if response.status_code == 404:
             logger.warning(f"No WHOIS data found for {domain}")
             return None
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        events = _rdap_events(data)
         
         result = {
-            "registrar": _safe_get(w.registrar),
-            "creation_date": _normalize_date(w.creation_date),
-            "expiration_date": _normalize_date(w.expiration_date),
-            "updated_date": _normalize_date(w.updated_date),
-            "name_servers": _normalize_nameservers(w.name_servers),
-            "registrant_country": _safe_get(w.country),
-            "raw_data": str(w.text) if hasattr(w, 'text') else None,
+            "registrar": _rdap_entity_field(data, "registrar", "fn"),
+            "creation_date": _normalize_date(events.get("registration")),
+            "expiration_date": _normalize_date(events.get("expiration")),
+            "updated_date": _normalize_date(events.get("last changed")),
+            "name_servers": _normalize_nameservers(
+                [ns.get("ldhName") for ns in data.get("nameservers", [])]
+            ),
+            "registrant_country": _rdap_country(data),
+            "raw_data": response.text,
         }
         
         logger.info(f"WHOIS lookup complete for {domain}: registrar={result['registrar']}")
         return result
         
-    except whois.parser.PywhoisError as e:
-        logger.warning(f"WHOIS parse error for {domain}: {str(e)}")
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+        logger.warning(f"WHOIS lookup error for {domain}: {str(e)}")
         return None
         
     except Exception as e:
@@ -97,6 +150,70 @@ def scan_whois(domain: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _rdap_events(data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Map RDAP events to {eventAction: eventDate}.
+    
+    Example: {"registration": "1997-09-15T04:00:00Z", "expiration": "..."}
+    """
+    return {
+        event["eventAction"]: event.get("eventDate")
+        for event in data.get("events", [])
+        if "eventAction" in event
+    }
+
+
+def _rdap_entities(data: Dict[str, Any], role: str) -> List[Dict[str, Any]]:
+    """
+    Find entities (registrar, registrant, ...) with a given role.
+    Entities can be nested inside other entities, so search recursively.
+    """
+    found = []
+    for entity in data.get("entities", []):
+        if role in entity.get("roles", []):
+            found.append(entity)
+        found.extend(_rdap_entities(entity, role))
+    return found
+
+
+def _vcard_properties(entity: Dict[str, Any], name: str) -> List[list]:
+    """
+    Get all properties called `name` from an entity's jCard.
+    
+    jCard format: ["vcard", [[name, params, type, value], ...]]
+    """
+    vcard = entity.get("vcardArray")
+    if not vcard or len(vcard) < 2:
+        return []
+    return [prop for prop in vcard[1] if prop and prop[0] == name]
+
+
+def _rdap_entity_field(data: Dict[str, Any], role: str, field: str) -> Optional[str]:
+    """
+    First value of a jCard field for the first entity with `role`.
+    Example: _rdap_entity_field(data, "registrar", "fn") → "MarkMonitor Inc."
+    """
+    for entity in _rdap_entities(data, role):
+        for prop in _vcard_properties(entity, field):
+            return _safe_get(prop[3])
+    return None
+
+
+def _rdap_country(data: Dict[str, Any]) -> Optional[str]:
+    """
+    Registrant country from the jCard address ("adr").
+    Uses the "cc" parameter if present, else the country-name slot.
+    """
+    for entity in _rdap_entities(data, "registrant"):
+        for prop in _vcard_properties(entity, "adr"):
+            params, value = prop[1], prop[3]
+            if params.get("cc"):
+                return _safe_get(params["cc"])
+            if isinstance(value, list) and len(value) >= 7 and value[6]:
+                return _safe_get(value[6])
+    return None
+
+
 def _safe_get(value) -> Optional[str]:
     """
     Safely extract a string value.
@@ -109,6 +226,33 @@ def _safe_get(value) -> Optional[str]:
     return str(value)
 
 
+# Date formats we know how to read, checked in order.
+# The regex picks the parser up front, so an unknown format is a cheap
+# non-match instead of a raised-and-caught ValueError for every attempt.
+# ISO 8601 (what RDAP uses) goes through fromisoformat - it's implemented in C
+# and much faster than strptime.
+_DATE_PARSERS: Tuple[Tuple["re.Pattern[str]", Callable[[str], datetime]], ...] = (
+    # 1997-09-15T04:00:00Z, 2019-09-09T15:39:04.123+02:00, 1997-09-15
+    (re.compile(r"\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?)?$"),
+     datetime.fromisoformat),
+    # 15-Sep-1997 (older registries)
+    (re.compile(r"\d{2}-[A-Za-z]{3}-\d{4}$"),
+     lambda value: datetime.strptime(value, "%d-%b-%Y")),
+)
+
+
+def _parse_date_string(value: str) -> Optional[datetime]:
+    """Parse a date string with the first matching entry in _DATE_PARSERS."""
+    value = value.strip()
+    for pattern, parse in _DATE_PARSERS:
+        if pattern.match(value):
+            try:
+                return parse(value)
+            except ValueError:
+                return None  # Right shape, impossible date (e.g. month 13)
+    return None
+
+
 def _normalize_date(date_value) -> Optional[datetime]:
     """
     Normalize date values from WHOIS.
@@ -121,16 +265,16 @@ def _normalize_date(date_value) -> Optional[datetime]:
         # Take the first date if it's a list
         date_value = date_value[0] if date_value else None
     
+    if isinstance(date_value, str):
+        # Parse string dates (RDAP uses ISO 8601, e.g. "1997-09-15T04:00:00Z")
+        date_value = _parse_date_string(date_value)
+    
     if isinstance(date_value, datetime):
+        # Store as naive UTC, like the rest of our DateTime columns
+        if date_value.tzinfo is not None:
+            date_value = date_value.astimezone(timezone.utc).replace(tzinfo=None)
         return date_value
     
-    # Try to parse string dates
-    if isinstance(date_value, str):
-        try:
-            return datetime.fromisoformat(date_value)
-        except ValueError:
-            return None
-    
     return None
 
 
@@ -145,11 +289,7 @@ def _normalize_nameservers(ns_value) -> Optional[List[str]]:
     if isinstance(ns_value, str):
         ns_value = [ns_value]
     
-    # Lowercase, strip trailing dots, remove duplicates
-    nameservers = list(set([
-        ns.lower().rstrip(".") 
-        for ns in ns_value 
-        if ns
-    ]))
+    # Lowercase, strip trailing dots, remove duplicates - one set, one pass
+    nameservers = {ns.lower().rstrip(".") for ns in ns_value if ns}
     
     return sorted(nameservers) if nameservers else None
\ No newline at end of file
@@ -7,7 +7,7 @@
 # This is where FastAPI starts. It:
 # 1. Creates the FastAPI application
 # 2. Registers all routers (domains, scans)
-# 3. Sets up database tables
+# 3. Sets up database tables (and closes the pool on shutdown)
 # 4. Defines health check endpoint
 #
 # HOW TO RUN:
@@ -23,17 +23,27 @@
 # GET  /docs          → Swagger UI (auto-generated)
 # GET  /api/domains   → List domains
 # POST /api/domains   → Add domain
-# POST /api/scans     → Run a scan
+# POST /api/scans     → Start a scan (runs in background)
 # GET  /api/scans/{id}→ Get scan results
 # ═══════════════════════════════════════════════════════════════════════════════
 
-from fastapi import FastAPI
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
+from typing import Optional
 import logging
+import orjson
 
 from app.config import get_settings
-from app.database import engine, Base
+from app.database import get_engine, dispose_engine, Base
 from app.routers import domains_router, scans_router
+from app.scrapers import get_resolver
 from app.schemas import HealthResponse
 
 # ─────────────────────────────────────────────────────────────────────────────────
@@ -50,6 +60,80 @@ logger = logging.getLogger(__name__)
 # ─────────────────────────────────────────────────────────────────────────────────
 settings = get_settings()
 
+# ─────────────────────────────────────────────────────────────────────────────────
+# LIFESPAN (STARTUP + SHUTDOWN)
+# ─────────────────────────────────────────────────────────────────────────────────
+# Code before `yield` runs once when the worker starts, code after it runs
+# once when the worker shuts down.
+#
+# Startup warms everything the first request would otherwise have to set up,
+# running the warmups CONCURRENTLY (asyncio.gather) so readiness waits for the
+# slowest one, not the sum:
+# - database: creates tables if they don't exist - ONLY in dev/test
+#   (stage/prod schemas are managed by migrations, e.g. Alembic) -
+#   and opens the first pooled connection
+# - DNS: builds the shared resolver (reads /etc/resolv.conf once)
+# Shutdown closes every pooled connection so RDS isn't left with stale ones,
+# and the shared RDAP HTTP client.
+SCHEMA_AUTOCREATE_ENVIRONMENTS = ("dev", "test")
+
+
+async def _warm_db() -> None:
+    """Build the engine + pool and make sure the tables exist (dev/test)."""
+    # Build the engine + pool now (not at import time)
+    engine = get_engine()
+    
+    if settings.environment in SCHEMA_AUTOCREATE_ENVIRONMENTS:
+        # Create all tables
+        # create_all is a sync API, so run it through the async connection
+        async with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                # When several pods start at once, only one checks/creates the
+                # schema at a time; the rest wait, then find the tables exist.
+                # xact lock → released automatically when this transaction ends.
+                await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('modena_schema'))"))
+            await conn.run_sync(Base.metadata.create_all)
+        logger.info("Database tables created/verified")
+    else:
+        # No schema work, but still open the first pooled connection
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        logger.info(f"Skipping create_all in {settings.environment} (schema is managed by migrations)")
+
+
+async def _warm_dns_resolver() -> None:
+    """Build the DNS resolver (and answer cache) shared by every scan."""
+    get_resolver()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run on application startup and shutdown.
+    """
+    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
+    logger.info(f"Environment: {settings.environment}")
+    logger.info(f"Database: {settings.database_host}:{settings.database_port}/{settings.database_name}")
+    
+    await asyncio.gather(
+        _warm_db(),
+        _warm_dns_resolver(),
+    )
+    
+    yield
+    
+    # Close the connection pool
+    await dispose_engine()
+    logger.info("Database connection pool closed")
+    
+    # Close the shared RDAP (WHOIS) HTTP client, if a scan created it.
+    # Only look if the whois module was loaded (by a scan) - importing it
+    # here just to close nothing would defeat the lazy scraper imports.
+    whois = sys.modules.get("app.scrapers.whois")
+    if whois:
+        await whois.close_rdap_client()
+
+
 # ─────────────────────────────────────────────────────────────────────────────────
 # CREATE FASTAPI APP
 # ─────────────────────────────────────────────────────────────────────────────────
@@ -70,47 +154,68 @@ app = FastAPI(
     - Terraform infrastructure
     - Jenkins CI/CD
     """,
-    docs_url="/docs",      # Swagger UI
-    redoc_url="/redoc",    # ReDoc UI
+    # /openapi.json, /docs and /redoc are registered below (API DOCS section)
+    # so the schema can be served from a cache
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
+    lifespan=lifespan,     # Startup/shutdown hooks (see above)
+    # Serialize responses with orjson instead of the stdlib json module
+    # (the domain/scan routes already send bytes from model_dump_json)
+    default_response_class=ORJSONResponse,
 )
 
 # ─────────────────────────────────────────────────────────────────────────────────
 # CORS MIDDLEWARE
 # ─────────────────────────────────────────────────────────────────────────────────
 # Allows frontend (React) to call this API from different origin
+# Exact origins from CORS_ORIGINS, not "*":
+# - browsers reject "*" together with allow_credentials=True
+# - an explicit list is a quick set lookup per request
+# Methods are only the ones our routers actually register.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
+    allow_origins=settings.cors_origin_list,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["*"],
 )
 
 # ─────────────────────────────────────────────────────────────────────────────────
-# CREATE DATABASE TABLES
+# REGISTER ROUTERS
 # ─────────────────────────────────────────────────────────────────────────────────
-# This creates tables if they don't exist
-# In production, you'd use Alembic migrations instead
-@app.on_event("startup")
-async def startup_event():
-    """
-    Run on application startup.
-    Creates database tables if they don't exist.
-    """
-    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
-    logger.info(f"Environment: {settings.environment}")
-    logger.info(f"Database: {settings.database_host}:{settings.database_port}/{settings.database_name}")
-    
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created/verified")
+app.include_router(domains_router)
+app.include_router(scans_router)
 
 
 # ─────────────────────────────────────────────────────────────────────────────────
-# REGISTER ROUTERS
+# API DOCS (OpenAPI schema, Swagger UI, ReDoc)
 # ─────────────────────────────────────────────────────────────────────────────────
-app.include_router(domains_router)
-app.include_router(scans_router)
+# The routes never change while the app is running, so the OpenAPI schema is
+# built and serialized (with orjson) ONCE, on the first request, and every
+# Swagger/ReDoc page load after that just sends the cached bytes.
+_openapi_json: Optional[bytes] = None
+
+
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_json():
+    """OpenAPI schema (cached)."""
+    global _openapi_json
+    if _openapi_json is None:
+        _openapi_json = orjson.dumps(app.openapi())
+    return Response(_openapi_json, media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui():
+    """Swagger UI."""
+    return get_swagger_ui_html(openapi_url="/openapi.json", title=f"{app.title} - Swagger UI")
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc():
+    """ReDoc UI."""
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{app.title} - ReDoc")
 
 
 # ─────────────────────────────────────────────────────────────────────────────────
@@ -135,9 +240,50 @@ def root():
 # CRITICAL FOR KUBERNETES!
 # K8s uses this to know if pod is healthy.
 # If this returns error, K8s restarts the pod.
+#
+# WHY CACHE THE DB CHECK?
+# Liveness + readiness probes (and load balancers) can hit /health every
+# second. Running SELECT 1 for every hit borrows a pool connection each time.
+# Instead we remember the last result for a couple of seconds; the lock makes
+# sure only ONE request does the real ping when the cached result goes stale.
+HEALTH_CHECK_TTL_SECONDS = 2.0
+
+_health_lock = asyncio.Lock()
+_health_checked_at = 0.0
+_health_db_connected = False
+
+
+async def _database_connected() -> bool:
+    """
+    Return the cached DB status, re-pinging at most once per TTL.
+    """
+    global _health_checked_at, _health_db_connected
+    
+    if time.monotonic() - _health_checked_at < HEALTH_CHECK_TTL_SECONDS:
+        return _health_db_connected
+    
+    async with _health_lock:
+        # Another request may have refreshed it while we waited for the lock
+        if time.monotonic() - _health_checked_at < HEALTH_CHECK_TTL_SECONDS:
+            return _health_db_connected
+        
+        engine = get_engine()
+        # pool.status() is local bookkeeping (no network) - handy in the logs
+        logger.debug(f"Health check ping, pool: {engine.pool.status()}")
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            _health_db_connected = True
+        except Exception as e:
+            logger.error(f"Database health check failed: {str(e)}")
+            _health_db_connected = False
+        _health_checked_at = time.monotonic()
+    
+    return _health_db_connected
+
 
 @app.get("/health", response_model=HealthResponse)
-def health_check():
+async def health_check():
     """
     Health check endpoint for Kubernetes.
     
@@ -147,16 +293,8 @@ def health_check():
     From your Dsny experience (Datadog monitors):
     This is like the monitors you set up - "Is the service healthy?"
     """
-    # Try to connect to database
-    db_connected = False
-    try:
-        from app.database import SessionLocal
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
-        db_connected = True
-    except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
+    # Is the database reachable? (cached for HEALTH_CHECK_TTL_SECONDS)
+    db_connected = await _database_connected()
     
     return HealthResponse(
         status="healthy" if db_connected else "unhealthy",
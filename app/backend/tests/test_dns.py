@@ -0,0 +1,143 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# TESTS - DNS RECORD SCRAPER
+# ═══════════════════════════════════════════════════════════════════════════════
+# No network: scan_dns_records gets a fake resolver whose resolve() returns
+# canned answers (or raises) per record type.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import asyncio
+from types import SimpleNamespace
+
+import dns.exception
+import dns.rdata
+import dns.resolver
+import pytest
+
+from app.scrapers import dns as dns_scraper
+
+
+class FakeAnswer(list):
+    """Stand-in for dns.resolver.Answer: a list of rdata with a ttl."""
+    ttl = 300
+
+
+def _answer(record_type, *texts):
+    return FakeAnswer(dns.rdata.from_text("IN", record_type, text) for text in texts)
+
+
+class FakeResolver:
+    """
+    resolve() answers from `answers` (record type → FakeAnswer or exception).
+    Record types not in `answers` raise NoAnswer. Every call waits `delay`
+    seconds, and the fake tracks how many calls were in flight at once and
+    how many got cancelled.
+    """
+
+    def __init__(self, answers, delay=0.0):
+        self.answers = answers
+        self.delay = delay
+        self.queried = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def resolve(self, name, record_type):
+        self.queried.append(record_type)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            answer = self.answers.get(record_type, dns.resolver.NoAnswer())
+            # Errors come back straight away, answers after the delay
+            if isinstance(answer, Exception):
+                raise answer
+            await asyncio.sleep(self.delay)
+            return answer
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+def scan(resolver):
+    """Run the DNS scan for example.com against a fake resolver."""
+    return dns_scraper.scan_dns_records("example.com", resolver=resolver)
+
+
+@pytest.mark.asyncio
+async def test_scan_dns_records_queries_every_type_concurrently():
+    resolver = FakeResolver(
+        {record_type: _answer("A", "192.0.2.1") for record_type in dns_scraper.RECORD_TYPES},
+        delay=0.05,
+    )
+
+    await scan(resolver)
+
+    assert sorted(resolver.queried) == sorted(dns_scraper.RECORD_TYPES)
+    assert resolver.max_in_flight == len(dns_scraper.RECORD_TYPES)
+
+
+@pytest.mark.asyncio
+async def test_scan_dns_records_extracts_values_in_record_type_order():
+    resolver = FakeResolver({
+        "MX": _answer("MX", "10 mx1.example.com.", "20 mx2.example.com."),
+        "A": _answer("A", "192.0.2.1"),
+        "TXT": _answer("TXT", '"v=spf1 " "-all"'),
+        "NS": _answer("NS", "ns1.example.com."),
+        "SOA": _answer("SOA", "ns1.example.com. admin.example.com. 2024010101 3600 600 86400 300"),
+    })
+
+    records = await scan(resolver)
+
+    assert records == [
+        {"record_type": "A", "record_value": "192.0.2.1", "ttl": 300},
+        {"record_type": "MX", "record_value": "mx1.example.com", "ttl": 300, "priority": 10},
+        {"record_type": "MX", "record_value": "mx2.example.com", "ttl": 300, "priority": 20},
+        {"record_type": "TXT", "record_value": "v=spf1 -all", "ttl": 300},
+        {"record_type": "NS", "record_value": "ns1.example.com", "ttl": 300},
+        {"record_type": "SOA",
+         "record_value": "ns1.example.com. admin.example.com. (serial: 2024010101)", "ttl": 300},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_scan_dns_records_skips_types_that_fail():
+    resolver = FakeResolver({
+        "A": _answer("A", "192.0.2.1"),
+        "AAAA": dns.resolver.NoAnswer(),
+        "MX": dns.exception.Timeout(),
+        "TXT": dns.resolver.NoNameservers(),
+        "NS": RuntimeError("unexpected"),
+    })
+
+    records = await scan(resolver)
+
+    assert [r["record_type"] for r in records] == ["A"]
+
+
+@pytest.mark.asyncio
+async def test_scan_dns_records_nxdomain_cancels_other_lookups():
+    # Everything but A would take 10s - NXDOMAIN must not wait for them
+    resolver = FakeResolver(
+        {record_type: _answer("A", "192.0.2.1") for record_type in dns_scraper.RECORD_TYPES},
+        delay=10,
+    )
+    resolver.answers["A"] = dns.resolver.NXDOMAIN()
+
+    records = await asyncio.wait_for(scan(resolver), timeout=1)
+    await asyncio.sleep(0)  # Let the cancellations land
+
+    assert records == []
+    assert resolver.cancelled == len(dns_scraper.RECORD_TYPES) - 1
+
+
+def test_extract_txt_joins_chunks_and_replaces_invalid_bytes():
+    assert dns_scraper._extract_txt(SimpleNamespace(strings=(b"v=spf1 ", "include:x ", b"-all"))) == "v=spf1 include:x -all"
+    assert dns_scraper._extract_txt(SimpleNamespace(strings=(b"caf\xc3\xa9",))) == "café"
+    assert dns_scraper._extract_txt(SimpleNamespace(strings=(b"caf\xff",))) == "caf�"
+
+
+def test_extract_mx_returns_host_and_priority():
+    rdata = dns.rdata.from_text("IN", "MX", "10 mx.example.com.")
+
+    assert dns_scraper._extract_mx(rdata) == ("mx.example.com", 10)
@@ -0,0 +1,134 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# TESTS - SCANS ROUTER (background scan pipeline)
+# ═══════════════════════════════════════════════════════════════════════════════
+# Runs the real routers against a throwaway SQLite database with the scrapers
+# monkeypatched. TestClient runs background tasks before returning, so by
+# the time POST /api/scans returns, _run_scan has already finished.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.database as database
+from app import scrapers
+from app.database import Base
+from app.routers import scans as scans_router
+from main import app
+
+DNS_RESULTS = [
+    {"record_type": "A", "record_value": "192.0.2.1", "ttl": 300},
+    {"record_type": "MX", "record_value": "mx.example.com", "ttl": 300, "priority": 10},
+]
+WHOIS_RESULT = {"registrar": "Example Registrar, Inc.", "name_servers": ["ns1.example.com"]}
+SUBDOMAIN_RESULTS = [
+    {"subdomain_name": "www", "full_domain": "www.example.com", "ip_address": "192.0.2.1", "is_alive": True},
+]
+
+
+def _returns(value):
+    """Fake scraper that returns `value`."""
+    async def scraper(domain, *args, **kwargs):
+        return value
+    return scraper
+
+
+def _raises(exc):
+    """Fake scraper that raises `exc`."""
+    async def scraper(domain, *args, **kwargs):
+        raise exc
+    return scraper
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """TestClient on a fresh SQLite database, with working fake scrapers."""
+    # NullPool: every request gets its own event loop, so don't keep connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    asyncio.run(create_tables())
+
+    monkeypatch.setattr(database, "_engine", engine)
+    database.async_session_factory.configure(bind=engine)
+    scans_router._DOMAIN_ID_CACHE.clear()  # ids from other test databases
+
+    monkeypatch.setattr(scrapers, "scan_dns_records", _returns(DNS_RESULTS))
+    monkeypatch.setattr(scrapers, "scan_whois", _returns(WHOIS_RESULT))
+    monkeypatch.setattr(scrapers, "scan_subdomains", _returns(SUBDOMAIN_RESULTS))
+
+    yield TestClient(app)
+
+    database.async_session_factory.configure(bind=None)
+    scans_router._DOMAIN_ID_CACHE.clear()
+    asyncio.run(engine.dispose())
+
+
+def _run(client, **options):
+    """Start a scan (runs to completion) and return its full results."""
+    response = client.post("/api/scans", json={"domain_name": "example.com", **options})
+    assert response.status_code == 202
+    assert response.json()["status"] == "running"
+
+    return client.get(f"/api/scans/{response.json()['id']}").json()
+
+
+def test_completed_scan_stores_all_results(client):
+    result = _run(client)
+
+    assert result["scan"]["status"] == "completed"
+    assert result["scan"]["completed_at"] is not None
+    assert result["scan"]["error_message"] is None
+    assert result["domain"]["domain_name"] == "example.com"
+    assert [(r["record_type"], r["record_value"], r["priority"]) for r in result["dns_records"]] == [
+        ("A", "192.0.2.1", None),
+        ("MX", "mx.example.com", 10),
+    ]
+    assert result["whois"]["registrar"] == "Example Registrar, Inc."
+    assert result["whois"]["name_servers"] == ["ns1.example.com"]
+    assert [s["full_domain"] for s in result["subdomains"]] == ["www.example.com"]
+
+
+def test_raising_scraper_marks_scan_failed(client, monkeypatch):
+    monkeypatch.setattr(scrapers, "scan_subdomains", _raises(RuntimeError("resolver exploded")))
+
+    result = _run(client)
+
+    assert result["scan"]["status"] == "failed"
+    assert result["scan"]["error_message"] == "resolver exploded"
+    assert result["scan"]["completed_at"] is not None
+    assert result["dns_records"] == []
+    assert result["whois"] is None
+    assert result["subdomains"] == []
+
+
+def test_failure_while_saving_leaves_no_partial_rows(client, monkeypatch):
+    # DNS rows are inserted first, then the bad subdomain row blows up
+    # (no full_domain) - the DNS rows must be rolled back with it.
+    monkeypatch.setattr(scrapers, "scan_subdomains", _returns([{"subdomain_name": "www"}]))
+
+    result = _run(client)
+
+    assert result["scan"]["status"] == "failed"
+    assert "full_domain" in result["scan"]["error_message"]
+    assert result["dns_records"] == []
+    assert result["whois"] is None
+    assert result["subdomains"] == []
+
+
+def test_skipped_whois_and_subdomains(client, monkeypatch):
+    # If the flags were ignored these would fail the scan
+    monkeypatch.setattr(scrapers, "scan_whois", _raises(AssertionError("whois should be skipped")))
+    monkeypatch.setattr(scrapers, "scan_subdomains", _raises(AssertionError("subdomains should be skipped")))
+
+    result = _run(client, include_whois=False, include_subdomains=False)
+
+    assert result["scan"]["status"] == "completed"
+    assert len(result["dns_records"]) == 2
+    assert result["whois"] is None
+    assert result["subdomains"] == []
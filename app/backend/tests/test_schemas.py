@@ -0,0 +1,62 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# TESTS - REQUEST SCHEMAS (domain name normalization)
+# ═══════════════════════════════════════════════════════════════════════════════
+# DomainCreate / ScanCreate clean up domain_name when the request is parsed.
+# These tests pin that API contract.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.schemas import DomainCreate, ScanCreate
+from main import app
+
+
+def _error_types(exc_info):
+    return [error["type"] for error in exc_info.value.errors()]
+
+
+@pytest.mark.parametrize("schema", [DomainCreate, ScanCreate])
+@pytest.mark.parametrize("value, expected", [
+    ("  Google.COM. ", "google.com"),       # strip, lowercase, trailing dot
+    ("münchen.de", "xn--mnchen-3ya.de"),    # IDN → punycode
+])
+def test_domain_name_is_normalized(schema, value, expected):
+    assert schema(domain_name=value).domain_name == expected
+
+
+@pytest.mark.parametrize("value", [
+    "foo..com",             # empty label
+    "_dmarc.example.com",   # underscore isn't a valid hostname character
+])
+def test_invalid_domain_name_is_rejected(value):
+    with pytest.raises(ValidationError) as exc_info:
+        DomainCreate(domain_name=value)
+
+    assert _error_types(exc_info) == ["value_error"]
+
+
+def test_non_string_reaches_pydantic_type_error():
+    with pytest.raises(ValidationError) as exc_info:
+        DomainCreate(domain_name=123)
+
+    assert _error_types(exc_info) == ["string_type"]
+
+
+def test_min_length_applies_after_normalization():
+    # " AB. " is 5 characters raw, but only "ab" after normalization
+    with pytest.raises(ValidationError) as exc_info:
+        DomainCreate(domain_name=" AB. ")
+
+    assert _error_types(exc_info) == ["string_too_short"]
+
+
+def test_invalid_domain_name_returns_422():
+    # Rejected while parsing the body - no database needed
+    client = TestClient(app)
+
+    response = client.post("/api/domains", json={"domain_name": "foo..com"})
+
+    assert response.status_code == 422
+    assert "Empty Label" in response.json()["detail"][0]["msg"]
@@ -0,0 +1,128 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# TESTS - WHOIS (RDAP) SCRAPER
+# ═══════════════════════════════════════════════════════════════════════════════
+# No network: the shared RDAP client is swapped for one whose transport is an
+# httpx.MockTransport that answers like rdap.org + a registry RDAP server.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.scrapers import whois
+
+REGISTRY_URL = "https://rdap.registry.test/domain/{domain}"
+
+# Trimmed-down RDAP domain response (RFC 9083)
+RDAP_DOCUMENT = {
+    "objectClassName": "domain",
+    "ldhName": "EXAMPLE.COM",
+    "events": [
+        {"eventAction": "registration", "eventDate": "1997-09-15T04:00:00Z"},
+        {"eventAction": "expiration", "eventDate": "2028-09-14T04:00:00Z"},
+        {"eventAction": "last changed", "eventDate": "2019-09-09T15:39:04+02:00"},
+    ],
+    "entities": [
+        {
+            "roles": ["registrar"],
+            "vcardArray": ["vcard", [
+                ["version", {}, "text", "4.0"],
+                ["fn", {}, "text", "Example Registrar, Inc."],
+            ]],
+            # Nested entity - found by the recursive search
+            "entities": [
+                {
+                    "roles": ["registrant"],
+                    "vcardArray": ["vcard", [
+                        ["adr", {"cc": "US"}, "text", ["", "", "", "", "CA", "", "United States"]],
+                    ]],
+                },
+            ],
+        },
+    ],
+    "nameservers": [
+        {"ldhName": "NS1.EXAMPLE.COM"},
+        {"ldhName": "ns2.example.com."},
+        {"ldhName": "ns1.example.com"},
+    ],
+}
+
+
+@pytest_asyncio.fixture
+async def rdap_requests(monkeypatch):
+    """
+    Route the shared RDAP client through a fake rdap.org + registry.
+    Yields the list of requests the client made.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        domain = request.url.path.rsplit("/", 1)[-1]
+        if request.url.host == "rdap.org":
+            # Bootstrap service: redirect to the registry's RDAP server
+            return httpx.Response(302, headers={"Location": REGISTRY_URL.format(domain=domain)})
+        if domain == "missing.com":
+            return httpx.Response(404)
+        if domain == "notjson.com":
+            return httpx.Response(200, content=b"<html>not json</html>")
+        return httpx.Response(200, json=RDAP_DOCUMENT)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+    monkeypatch.setattr(whois, "_RDAP_CLIENT", client)
+    yield requests
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_scan_whois_maps_rdap_fields(rdap_requests):
+    result = await whois.scan_whois("example.com")
+
+    assert result["registrar"] == "Example Registrar, Inc."
+    assert result["registrant_country"] == "US"
+    assert result["name_servers"] == ["ns1.example.com", "ns2.example.com"]
+    # Dates are naive UTC (matches the DateTime columns)
+    assert result["creation_date"] == datetime(1997, 9, 15, 4, 0)
+    assert result["expiration_date"] == datetime(2028, 9, 14, 4, 0)
+    assert result["updated_date"] == datetime(2019, 9, 9, 13, 39, 4)
+    assert result["updated_date"].tzinfo is None
+    assert "Example Registrar" in result["raw_data"]
+
+
+@pytest.mark.asyncio
+async def test_scan_whois_follows_bootstrap_redirect(rdap_requests):
+    assert await whois.scan_whois("example.com") is not None
+
+    assert [r.url.host for r in rdap_requests] == ["rdap.org", "rdap.registry.test"]
+    assert rdap_requests[0].headers["Accept"] == "application/rdap+json"
+
+
+@pytest.mark.asyncio
+async def test_scan_whois_not_found_returns_none(rdap_requests):
+    assert await whois.scan_whois("missing.com") is None
+
+
+@pytest.mark.asyncio
+async def test_scan_whois_non_json_body_returns_none(rdap_requests):
+    assert await whois.scan_whois("notjson.com") is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1997-09-15T04:00:00Z", datetime(1997, 9, 15, 4, 0, tzinfo=timezone.utc)),
+    ("2019-09-09T15:39:04+02:00", datetime(2019, 9, 9, 15, 39, 4, tzinfo=timezone(timedelta(hours=2)))),
+    ("15-Sep-1997", datetime(1997, 9, 15)),
+    ("1997-13-01", None),    # Right shape, impossible month
+    ("not a date", None),
+])
+def test_parse_date_string(value, expected):
+    parsed = whois._parse_date_string(value)
+
+    assert parsed == expected
+    if expected is not None:
+        assert parsed.utcoffset() == expected.utcoffset()
+
+
+def test_normalize_date_converts_to_naive_utc():
+    assert whois._normalize_date("2019-09-09T15:39:04+02:00") == datetime(2019, 9, 9, 13, 39, 4)